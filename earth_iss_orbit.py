@@ -31,17 +31,27 @@ orbit_radius = 1.2
 angle = 0
 inclination = radians(51.6)  # Real ISS 51.6° inclination
 
-while True:
-    rate(60)
+def animate(angle=0):
+    # hot names bound to locals (LOAD_FAST) and loop invariants hoisted
+    _rate, _sin, _cos, _vector = rate, sin, cos, vector
+    spin = earth.rotate
+    spin_axis = vector(0,1,0)
+    y_amp = orbit_radius * sin(inclination)
 
-    # Earth rotation
-    earth.rotate(angle=0.01, axis=vector(0,1,0))
+    while True:
+        _rate(60)
 
-    # Satellite orbit math with inclination
-    x = orbit_radius * cos(angle)
-    z = orbit_radius * sin(angle)
-    y = orbit_radius * sin(inclination) * sin(angle)
+        # Earth rotation
+        spin(angle=0.01, axis=spin_axis)
 
-    iss.pos = vector(x, y, z)
+        # Satellite orbit math with inclination
+        s = _sin(angle)
+        x = orbit_radius * _cos(angle)
+        z = orbit_radius * s
+        y = y_amp * s
 
-    angle += 0.03
+        iss.pos = _vector(x, y, z)
+
+        angle += 0.03
+
+animate(angle)
@@ -1,12 +1,18 @@
-import requests
+import requests_cache
 
 # Celestrak ISS TLE source
 URL = "https://celestrak.org/NORAD/elements/gp.php?CATNR=25544&FORMAT=TLE"
 
+# Cached session: repeat fetches within 30 min are served locally, and stale
+# entries are revalidated with ETag / Last-Modified (304 = no body re-sent).
+# Shared by every tracker (iss_real.py, iss_core.py) so there is one cache setup.
+TLE_CACHE_S = 60 * 30
+session = requests_cache.CachedSession("tle_cache", expire_after=TLE_CACHE_S, cache_control=True)
+
 def fetch_iss_tle():
     print("📡 Fetching ISS TLE data...")
 
-    r = requests.get(URL, timeout=10)
+    r = session.get(URL, timeout=10)
 
     if r.status_code != 200:
         print("❌ Error: Unable to fetch TLE")
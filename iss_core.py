@@ -0,0 +1,519 @@
+# iss_core.py
+# Shared core of the Skyfield ISS trackers (iss_real_enhanced.py,
+# iss_real_final.py, iss_tracker_final.py):
+# - cached TLE loading + SGP4 propagation with per-frame extrapolation
+# - VPython marker / trail / labels on top of iss_scene.build_scene()
+# - CSV telemetry written from a background thread
+# - optional solar-wind + Kp overlay, ground dot and 2D ground-track plot
+#
+# The scripts only differ in the Config they pass to ISSTracker.
+
+from vpython import sphere, arrow, label, vector, color, rate
+from skyfield.api import load, wgs84
+from dataclasses import dataclass
+from typing import Optional
+from datetime import datetime
+import httpx
+import orjson
+import time, math, os, csv, atexit, queue, threading, asyncio, heapq, itertools
+import numpy as np
+
+from iss_scene import build_scene
+from fetch_tle import session as tle_session
+
+EARTH_RADIUS_KM = 6371.0
+SW_URL = "https://services.swpc.noaa.gov/json/solar-wind/near-real-time.json"
+KP_URL = "https://services.swpc.noaa.gov/products/noaa-planetary-k-index.json"
+LOG_COLUMNS = ["timestamp_utc","lat_deg","lon_deg","alt_km","speed_km_s"]
+SPACE_WEATHER_COLUMNS = ["sw_speed_km_s","sw_density","kp_index"]
+
+
+@dataclass
+class Config:
+    title: str = "🌍 ISS RealTime Tracker"
+    fps: int = 20                   # VPython frame rate
+    # TLE
+    tle_url: str = "https://celestrak.org/NORAD/elements/stations.txt"
+    tle_path: str = "data/stations.txt"  # local TLE copy handed to Skyfield (untracked)
+    tle_refresh_s: float = 60 * 30  # how often to re-check the TLE
+    tle_max_age_h: float = 12       # re-download once the cached ISS epoch is older than this
+    prop_interval_s: float = 1.0    # seconds between SGP4 propagations (extrapolated in between)
+    # visuals
+    orbit_scale: float = 1.4
+    iss_scale: float = 0.18
+    trail_len: int = 2000           # trail points retained by VPython
+    enable_ground_dot: bool = False # sub-satellite dot + lat/lon readout
+    # telemetry
+    log_path: str = "data/iss_telemetry.csv"
+    log_interval_s: float = 10
+    log_queue_size: int = 1024      # max rows waiting for the writer thread
+    # console line per logged row; fields: status, ts, lat, lon, alt, speed
+    log_fmt: str = "🛰 {status} {ts} lat={lat:.2f} lon={lon:.2f} alt={alt:.0f} km"
+    # space weather
+    sw_fetch_s: float = 120
+    enable_kp: bool = False         # Kp fetch, Kp colour coding, solar columns in the CSV
+    # solar-wind label; fields: speed, density, bt, time_tag
+    sw_label_fmt: str = "SW speed={speed} km/s density={density} ({time_tag})"
+    # 2D ground track
+    enable_ground_track: bool = False
+    map_update_s: float = 5
+    track_step_s: float = 5         # spacing of ground-track samples
+    track_span_s: float = 3600      # ground track propagated per batch
+    track_max_pts: int = 500
+    ground_track_png: Optional[str] = None  # opt-in: headless Agg figure saved here instead of a window
+
+
+# ------------------- Shared per-process state -------------------
+ts = load.timescale()
+
+_bg_loop = None
+
+def background_loop():
+    """asyncio loop running on a daemon thread, started on first use."""
+    global _bg_loop
+    if _bg_loop is None:
+        _bg_loop = asyncio.new_event_loop()
+        threading.Thread(target=_bg_loop.run_forever, daemon=True).start()
+    return _bg_loop
+
+
+# ------------------- Skyfield / TLE -------------------
+def _find_iss(path):
+    for s in load.tle_file(path, reload=False):
+        if "ISS" in s.name:
+            return s
+    return None
+
+def load_iss_tle(cfg):
+    try:
+        # use the local copy unless its ISS epoch is too old, then re-download
+        sat = _find_iss(cfg.tle_path) if os.path.exists(cfg.tle_path) else None
+        if sat is None or (ts.now() - sat.epoch) * 24 > cfg.tle_max_age_h:
+            r = tle_session.get(cfg.tle_url, timeout=10)
+            r.raise_for_status()
+            os.makedirs(os.path.dirname(cfg.tle_path) or ".", exist_ok=True)
+            with open(cfg.tle_path, "wb") as f:
+                f.write(r.content)
+            sat = _find_iss(cfg.tle_path)
+        if sat is None:
+            raise RuntimeError("ISS not present in TLE list")
+        print("✅ Loaded ISS TLE:", sat.name)
+        return sat
+    except Exception as e:
+        print("❌ TLE load error:", e)
+        return None
+
+def get_iss_subpoint_and_speed(sat):
+    if sat is None:
+        return None
+    geoc = sat.at(ts.now())
+    sub = wgs84.subpoint(geoc)
+    try:
+        v = np.asarray(geoc.velocity.km_per_s)
+        speed = math.sqrt(v @ v)
+        vel_vpy = vector(*(v / EARTH_RADIUS_KM))
+    except Exception:
+        speed = 0.0
+        vel_vpy = vector(0, 0, 0)
+    pos_km = np.asarray(geoc.position.km)
+    # sub-satellite point on the unit globe: just the normalized position vector
+    ground_unit = pos_km / math.sqrt(pos_km @ pos_km)
+    return {
+        "lat": sub.latitude.degrees, "lon": sub.longitude.degrees,
+        "alt_km": sub.elevation.km, "speed_km_s": speed,
+        "pos_v": vector(*(pos_km / EARTH_RADIUS_KM)),
+        "vel_v": vel_vpy,  # Earth radii per second
+        "ground_v": vector(*ground_unit)
+    }
+
+
+# ------------------- Space weather -------------------
+def parse_solar_wind(r):
+    try:
+        data = orjson.loads(r.content)
+        if not data:
+            return None
+        last = data[-1]
+        return {
+            "time_tag": last.get("time_tag"),
+            "density": last.get("density"),
+            "speed": last.get("speed"),
+            "bt": last.get("bt"),
+        }
+    except Exception:
+        return None
+
+def parse_kp_index(r):
+    try:
+        arr = orjson.loads(r.content)
+        if not arr:
+            return None
+        last = arr[-1]
+        # last is like [ "2023-10-...T00:00:00Z", 1, ... ] — kp is at index 1 usually
+        kp = None
+        if len(last) > 1:
+            try:
+                kp = float(last[1])
+            except:
+                kp = None
+        return kp
+    except Exception:
+        return None
+
+def _usable(r):
+    # gather(return_exceptions=True) hands back the exception itself on failure
+    return not isinstance(r, Exception) and r.is_success
+
+async def fetch_space_weather(with_kp):
+    """Fetch solar wind (and Kp) concurrently; failed requests yield None."""
+    async with httpx.AsyncClient(timeout=8) as c:
+        if with_kp:
+            sw_r, kp_r = await asyncio.gather(c.get(SW_URL), c.get(KP_URL), return_exceptions=True)
+            return (parse_solar_wind(sw_r) if _usable(sw_r) else None,
+                    parse_kp_index(kp_r) if _usable(kp_r) else None)
+        try:
+            sw_r = await c.get(SW_URL)
+        except httpx.HTTPError:
+            return None, None
+        return (parse_solar_wind(sw_r) if sw_r.is_success else None), None
+
+
+# ------------------- CSV telemetry -------------------
+class TelemetryWriter:
+    """Rows are queued by the render loop and written by a daemon thread."""
+
+    def __init__(self, path, columns, maxsize=1024):
+        self.path = path
+        # header written up front, so readers (map_viewer.py) see it immediately
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, "w", newline="") as fh:
+                fh.write(",".join(columns) + "\n")
+        self.q = queue.Queue(maxsize=maxsize)
+        self.ok = True   # False while the CSV cannot be written
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def _run(self):
+        # the file is (re)opened lazily, so a lock (e.g. Excel) only drops rows while it lasts
+        fh = writer = None
+        while True:
+            row = self.q.get()
+            if row is None:
+                break
+            try:
+                if fh is None:
+                    fh = open(self.path, "a", newline="", buffering=1 << 16)
+                    writer = csv.writer(fh, lineterminator="\n")
+                    if not self.ok:
+                        print("✅ CSV file writable again — telemetry logging resumed")
+                        self.ok = True
+                writer.writerow(row)
+                if self.q.qsize() == 0:
+                    fh.flush()
+            except PermissionError:
+                if self.ok:
+                    print("⚠️ CSV file locked — dropping rows until it is writable (maybe open in Excel?)")
+                    self.ok = False
+                if fh is not None:
+                    try:
+                        fh.close()
+                    except OSError:
+                        pass
+                    fh = None
+        if fh is not None:
+            fh.close()
+
+    def put(self, row):
+        try:
+            self.q.put_nowait(row)
+        except queue.Full:
+            print("⚠️ Telemetry queue full — dropping row")
+
+    def close(self):
+        if self.thread.is_alive():
+            self.q.put(None)
+            self.thread.join(timeout=5)
+
+
+# ------------------- 2D ground track (matplotlib) -------------------
+class GroundTrack:
+    """Plate carrée ground track, batch-propagated; blitted in a window or saved as PNG."""
+
+    def __init__(self, cfg):
+        self.cfg = cfg
+        if cfg.ground_track_png:
+            # headless: plain Agg canvas, no pyplot and no GUI event loop
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            self.fig = Figure(figsize=(9,4.5))
+            FigureCanvasAgg(self.fig)
+            self.ax = self.fig.add_subplot()
+        else:
+            # imported here so trackers without a map never load matplotlib
+            import matplotlib.pyplot as plt
+            plt.ion()
+            self.fig, self.ax = plt.subplots(figsize=(9,4.5))
+        ax = self.ax
+        ax.set_title("ISS Ground Track (plate carrée)")
+        ax.set_xlim(-180, 180)
+        ax.set_ylim(-90, 90)
+        ax.set_xlabel("Longitude")
+        ax.set_ylabel("Latitude")
+        ax.grid(True, linestyle=':', color='gray', alpha=0.5)
+        self.lons, self.lats = [], []
+        self.buf = None   # (wall-clock start, lats, lons) from the last batch propagation
+        self.i = 0        # next unplotted sample in buf
+        if cfg.ground_track_png:
+            self.line, = ax.plot([], [], 'o-', color='yellow', markersize=4)
+            self.saver = None   # background thread rendering the current snapshot
+            return
+        self.line, = ax.plot([], [], 'o-', color='yellow', markersize=4, animated=True)
+
+        # blitting: cache the static axes once, then repaint only the track line
+        plt.show(block=False)
+        self.fig.canvas.draw()
+        self.bg = self.fig.canvas.copy_from_bbox(ax.bbox)
+        self.fig.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _save_png(self, lons, lats):
+        # write to a temp file and swap it in, so viewers never see a half-written PNG
+        path = self.cfg.ground_track_png
+        tmp = path + ".tmp"
+        try:
+            self.line.set_data(lons, lats)
+            self.fig.savefig(tmp, format="png")
+            os.replace(tmp, path)
+        except Exception as e:
+            print("⚠️ Ground track save error:", e)
+
+    def _on_draw(self, event):
+        # full redraws (e.g. window resize) invalidate the cached background
+        self.bg = self.fig.canvas.copy_from_bbox(self.ax.bbox)
+        self.ax.draw_artist(self.line)
+
+    def reset(self):
+        """Drop the precomputed batch (e.g. after a TLE refresh)."""
+        self.buf = None
+
+    def propagate(self, sat):
+        # one vectorized Skyfield call for the next track_span_s of sub-satellite points
+        t0 = time.time()
+        y, mo, d, h, mi, sec = ts.now().utc
+        times = ts.utc(y, mo, d, h, mi, sec + np.arange(0, self.cfg.track_span_s, self.cfg.track_step_s))
+        sub = wgs84.subpoint(sat.at(times))
+        return t0, sub.latitude.degrees, sub.longitude.degrees
+
+    def update(self, sat):
+        # re-propagate only when the precomputed batch has been used up
+        if self.buf is None or self.i >= len(self.buf[1]):
+            self.buf = self.propagate(sat)
+            self.i = 0
+        t0, lats, lons = self.buf
+        # append the samples whose time has passed since the last update
+        n = min(int((time.time() - t0) / self.cfg.track_step_s) + 1, len(lats))
+        self.lats.extend(lats[self.i:n].tolist())
+        self.lons.extend(lons[self.i:n].tolist())
+        self.i = n
+        del self.lats[:-self.cfg.track_max_pts]
+        del self.lons[:-self.cfg.track_max_pts]
+        if self.cfg.ground_track_png:
+            # snapshot at map cadence, rendered off the render loop; skipped while
+            # the previous save is still running (the figure is only touched there)
+            if self.saver is None or not self.saver.is_alive():
+                self.saver = threading.Thread(target=self._save_png,
+                                              args=(list(self.lons), list(self.lats)), daemon=True)
+                self.saver.start()
+            return
+        canvas = self.fig.canvas
+        canvas.restore_region(self.bg)
+        self.line.set_data(self.lons, self.lats)
+        self.ax.draw_artist(self.line)
+        canvas.blit(self.ax.bbox)
+        canvas.flush_events()
+
+
+# ------------------- Tracker -------------------
+class ISSTracker:
+    LABEL_DY = 0.12   # alt label height above the marker
+
+    def __init__(self, cfg):
+        self.cfg = cfg
+        os.makedirs(os.path.dirname(cfg.log_path) or ".", exist_ok=True)
+
+        self.iss = load_iss_tle(cfg)
+
+        # static objects (stars, Earth, light, orbit ring) are built once here
+        self.scene, self.earth = build_scene(cfg.title)
+
+        # ISS marker + trail + arrow + labels
+        self.iss_marker = sphere(radius=cfg.iss_scale, color=color.yellow, emissive=True,
+                                 make_trail=True, trail_color=color.cyan, retain=cfg.trail_len)
+        self.arrow_iss = arrow(color=color.red, shaftwidth=0.03, opacity=0.9)
+        self.alt_label = label(text='', pos=vector(0,0,0), height=14, box=False, color=color.white, opacity=0)
+        self.ground_dot = self.latlon_label = self.kp_alert_label = None
+        if cfg.enable_ground_dot:
+            # sub-satellite ground dot on globe (red) + lat/lon readout
+            self.ground_dot = sphere(radius=0.03, color=color.red, emissive=True)
+            self.latlon_label = label(text='', pos=vector(-1.6, 1.0, 0), height=12, box=True, color=color.white, opacity=0.3)
+        sw_y = 0.85 if cfg.enable_ground_dot else 1.1
+        self.sw_label = label(text='SW: N/A', pos=vector(-1.6, sw_y, 0), height=12, box=True, color=color.white, opacity=0.2)
+        if cfg.enable_kp:
+            self.kp_alert_label = label(text='', pos=vector(-1.6, sw_y - 0.15, 0), height=12, box=True, color=color.yellow, opacity=0.15)
+
+        # vectors reused every frame for marker / arrow / label placement
+        self.frame_pos, self.frame_axis, self.frame_label = vector(0,0,0), vector(0,0,0), vector(0,0,0)
+
+        columns = LOG_COLUMNS + (SPACE_WEATHER_COLUMNS if cfg.enable_kp else [])
+        self.writer = TelemetryWriter(cfg.log_path, columns, cfg.log_queue_size)
+        self.ground_track = GroundTrack(cfg) if cfg.enable_ground_track else None
+
+        # space weather results handed over from the background loop
+        self.sw_lock = threading.Lock()
+        self.sw_fresh = None
+        self.sw_cache = None
+        self.kp_cache = None
+
+        self.data = None
+        self.pos0 = self.vel = None
+        self.last_prop = 0.0
+
+        # periodic jobs in one min-heap of (due, seq, interval, job); each frame
+        # only compares the earliest deadline instead of testing every timer
+        self.events = []
+        self._seq = itertools.count()
+        now = time.time()
+        self.schedule(now + cfg.tle_refresh_s, cfg.tle_refresh_s, self.refresh_tle)
+        self.schedule(now, cfg.sw_fetch_s, self.fetch_space_weather)
+        self.schedule(now, cfg.log_interval_s, self.log)
+        if self.ground_track:
+            self.schedule(now, cfg.map_update_s, self.update_ground_track)
+
+    def schedule(self, due, interval, job):
+        heapq.heappush(self.events, (due, next(self._seq), interval, job))
+
+    # ---- periodic jobs ----
+    def refresh_tle(self):
+        new = load_iss_tle(self.cfg)
+        if new:
+            self.iss = new
+            if self.ground_track:
+                self.ground_track.reset()  # re-propagate with the new elements
+            print("🔄 TLE refreshed")
+
+    def fetch_space_weather(self):
+        # runs in the background; results picked up in step()
+        asyncio.run_coroutine_threadsafe(self._fetch_space_weather(), background_loop())
+
+    def update_ground_track(self):
+        if self.data is not None:
+            self.ground_track.update(self.iss)
+
+    # ---- background space-weather fetch ----
+    async def _fetch_space_weather(self):
+        result = await fetch_space_weather(self.cfg.enable_kp)
+        with self.sw_lock:
+            self.sw_fresh = result
+
+    def _apply_space_weather(self, sw, kp):
+        self.sw_cache, self.kp_cache = sw, kp
+        if sw:
+            self.sw_label.text = self.cfg.sw_label_fmt.format(**sw)
+            print("🔆 Solar wind:", sw)
+        if not self.cfg.enable_kp:
+            return
+        if kp is not None:
+            self.kp_alert_label.text = f"Kp = {kp}"
+            print("🔔 Kp index:", kp)
+        # color-code trail and marker based on Kp (geomagnetic); only changes with Kp
+        kp_val = kp if kp is not None else 0
+        if kp_val >= 6:
+            self.iss_marker.trail_color = color.red
+            self.iss_marker.color = color.red
+            self.kp_alert_label.color = color.red
+            self.kp_alert_label.box = True
+        elif kp_val >= 4:
+            self.iss_marker.trail_color = color.orange
+            self.iss_marker.color = color.orange
+            self.kp_alert_label.color = color.orange
+        else:
+            self.iss_marker.trail_color = color.cyan
+            self.iss_marker.color = color.yellow
+            self.kp_alert_label.color = color.yellow
+
+    # ---- per-frame work ----
+    def step(self, now):
+        """Propagation + due periodic jobs. Returns False while no ISS position is available."""
+        cfg = self.cfg
+
+        # space weather fetched in the background since the last frame
+        with self.sw_lock:
+            fresh, self.sw_fresh = self.sw_fresh, None
+        if fresh:
+            self._apply_space_weather(*fresh)
+
+        # propagate once per prop_interval_s; frames in between extrapolate along velocity
+        if self.data is None or now - self.last_prop > cfg.prop_interval_s:
+            data = get_iss_subpoint_and_speed(self.iss)
+            self.last_prop = now
+            if data is not None:
+                self.data = data
+                self.pos0, self.vel = data["pos_v"] * cfg.orbit_scale, data["vel_v"] * cfg.orbit_scale
+                self.alt_label.text = f"Alt: {data['alt_km']:.0f} km\nSpeed: {data['speed_km_s']:.2f} km/s"
+                if self.ground_dot:
+                    # ground dot: sub-satellite point on unit sphere (earth radius = 1)
+                    self.ground_dot.pos = data["ground_v"]
+                    self.latlon_label.text = f"Lat: {data['lat']:.3f}°\nLon: {data['lon']:.3f}°"
+
+        # run whichever periodic jobs are due (TLE, space weather, log, map)
+        events = self.events
+        while events[0][0] <= now:
+            _, _, interval, job = heapq.heappop(events)
+            job()
+            self.schedule(now + interval, interval, job)
+        return self.data is not None
+
+    def render(self, now):
+        # visual pos, written into reused vectors (no per-frame vector allocation)
+        fp, fa, fl = self.frame_pos, self.frame_axis, self.frame_label
+        pos0, vel = self.pos0, self.vel
+        k = now - self.last_prop
+        fp.x = pos0.x + vel.x * k
+        fp.y = pos0.y + vel.y * k
+        fp.z = pos0.z + vel.z * k
+        self.iss_marker.pos = fp
+
+        # arrow & labels
+        f = 0.35 / fp.mag
+        fa.x, fa.y, fa.z = fp.x * f, fp.y * f, fp.z * f
+        fl.x, fl.y, fl.z = fp.x, fp.y + self.LABEL_DY, fp.z
+        self.arrow_iss.pos = fp
+        self.arrow_iss.axis = fa
+        self.alt_label.pos = fl
+
+    def log(self):
+        data = self.data
+        if data is None:
+            return
+        ts_utc = datetime.utcnow().isoformat()
+        row = [ts_utc, data["lat"], data["lon"], data["alt_km"], data["speed_km_s"]]
+        msg = self.cfg.log_fmt.format(status="Logged" if self.writer.ok else "Not logged (CSV locked)",
+                                      ts=ts_utc, lat=data["lat"], lon=data["lon"],
+                                      alt=data["alt_km"], speed=data["speed_km_s"])
+        if self.cfg.enable_kp:
+            sw = self.sw_cache
+            sw_speed = sw['speed'] if (sw and 'speed' in sw) else None
+            sw_density = sw['density'] if (sw and 'density' in sw) else None
+            row += [sw_speed, sw_density, self.kp_cache]
+            msg += f" Kp={self.kp_cache}"
+        self.writer.put(row)
+        print(msg)
+
+    def run(self):
+        print("✅ Starting ISS tracker:", self.cfg.title)
+        fps = self.cfg.fps
+        while True:
+            rate(fps)
+            now = time.time()   # the only clock read per frame
+            if self.step(now):
+                self.render(now)
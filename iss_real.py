@@ -1,22 +1,26 @@
 from vpython import sphere, vector, color, rate, points
 from sgp4.api import Satrec, jday
 from datetime import datetime
-import pandas as pd
-import requests, math, os, time, random
+import math, os, time, csv, atexit
+import numpy as np
+from numba import njit
+from fetch_tle import session as tle_session
 
 # --------------------- CONFIG ---------------------
 TLE_URL = "https://celestrak.org/NORAD/elements/gp.php?CATNR=25544"  # ISS
 LOG_PATH = "data/iss_log.csv"
 UPDATE_INTERVAL = 10  # seconds between position updates
+LOG_FLUSH_ROWS = 32   # flush buffered rows to disk after this many...
+LOG_FLUSH_S = 5       # ...or after this many seconds
 # --------------------------------------------------
 
 # Ensure data folder exists
 os.makedirs("data", exist_ok=True)
 
-# Fetch live TLE data
+# Fetch live TLE data (cached; revalidated with ETag/Last-Modified once expired)
 def fetch_tle():
     print("Fetching latest TLE data for ISS...")
-    resp = requests.get(TLE_URL)
+    resp = tle_session.get(TLE_URL)
     lines = resp.text.strip().splitlines()
     return lines[0], lines[1], lines[2]
 
@@ -26,48 +30,66 @@ satellite = Satrec.twoline2rv(line1, line2)
 # --------------------- 3D ENVIRONMENT ---------------------
 earth = sphere(pos=vector(0,0,0), radius=6.4, texture="https://i.imgur.com/yoEzbtg.jpg")
 iss_marker = sphere(radius=0.15, color=color.red, make_trail=True)
-stars = points(pos=[vector((random()-0.5)*50, (random()-0.5)*50, (random()-0.5)*50) for _ in range(1000)],
+star_xyz = (np.random.random((1000, 3)) - 0.5) * 50
+stars = points(pos=[vector(*p) for p in star_xyz.tolist()],
                size=2*vector(1,1,1), color=color.white)
 
 # --------------------- DATA LOGGER ---------------------
-if not os.path.exists(LOG_PATH):
-    pd.DataFrame(columns=["timestamp","lat","lon","alt"]).to_csv(LOG_PATH, index=False)
+# Rows are buffered in memory and written in batches on a persistent handle
+_buffer = []
+_last_flush = time.time()
+if not os.path.exists(LOG_PATH) or os.path.getsize(LOG_PATH) == 0:
+    with open(LOG_PATH, "w", newline="") as f:
+        f.write(",".join(["timestamp","lat","lon","alt"]) + "\n")
+_fh = open(LOG_PATH, "a", newline="", buffering=1 << 16)
+_writer = csv.writer(_fh, lineterminator="\n")
+
+def _flush():
+    global _last_flush
+    if _buffer:
+        _writer.writerows(_buffer)
+        _buffer.clear()
+    _fh.flush()
+    _last_flush = time.time()
+
+atexit.register(_flush)
 
 def log_telemetry(lat, lon, alt):
-    df = pd.DataFrame([[datetime.utcnow(), lat, lon, alt]],
-                      columns=["timestamp","lat","lon","alt"])
-    df.to_csv(LOG_PATH, mode="a", index=False, header=False)
+    _buffer.append((datetime.utcnow(), lat, lon, alt))
+    if len(_buffer) >= LOG_FLUSH_ROWS or time.time() - _last_flush > LOG_FLUSH_S:
+        _flush()
 
 # --------------------- POSITION CALCULATION ---------------------
+@njit(cache=True, fastmath=True)
+def _ecef_to_llh(x, y, z):
+    # JIT-compiled on first call; returns lat, lon, alt and the unit direction
+    r = math.sqrt(x*x + y*y + z*z)
+    lat = math.degrees(math.asin(z / r))
+    lon = math.degrees(math.atan2(y, x))
+    return lat, lon, r - 6371.0, x / r, y / r, z / r
+
 def get_iss_position():
     now = datetime.utcnow()
     jd, fr = jday(now.year, now.month, now.day, now.hour, now.minute, now.second)
     e, r, v = satellite.sgp4(jd, fr)
     if e != 0:
         return None
-    x, y, z = r
-    lat = math.degrees(math.asin(z / math.sqrt(x**2 + y**2 + z**2)))
-    lon = math.degrees(math.atan2(y, x))
-    alt = math.sqrt(x**2 + y**2 + z**2) - 6371
-    return lat, lon, alt
+    lat, lon, alt, ux, uy, uz = _ecef_to_llh(*r)
+    return lat, lon, alt, (ux, uy, uz)
 
 # --------------------- MAIN LOOP ---------------------
 print("Starting live ISS tracker...")
 t0 = time.time()
+earth_r = earth.radius  # constant; avoid the VPython attribute lookup every frame
 
 while True:
     rate(2)
     pos = get_iss_position()
     if pos:
-        lat, lon, alt = pos
+        lat, lon, alt, unit = pos
 
-        # Convert lat/lon to 3D coordinates on sphere
-        phi = math.radians(lat)
-        theta = math.radians(lon)
-        x = earth.radius * math.cos(phi) * math.cos(theta)
-        y = earth.radius * math.cos(phi) * math.sin(theta)
-        z = earth.radius * math.sin(phi)
-        iss_marker.pos = vector(x, y, z)
+        # Place marker on the sphere along the satellite direction
+        iss_marker.pos = earth_r * vector(*unit)
 
         # Periodically log data
         if time.time() - t0 > UPDATE_INTERVAL:
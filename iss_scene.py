@@ -0,0 +1,36 @@
+# iss_scene.py
+# Static part of the VPython scene shared by the ISS trackers:
+# canvas + camera, star field, textured Earth, light and orbit ring.
+# Built once at startup; the render loops never touch these objects again,
+# so VPython has nothing to re-send for them after the first frame.
+
+from vpython import canvas, points, sphere, ring, local_light, vector, color, textures
+import numpy as np
+
+N_STARS = 600
+
+
+def build_scene(title):
+    scene = canvas(title=title, width=1200, height=800, background=color.black)
+    scene.camera.pos = vector(0, 0, 6)
+    scene.camera.axis = vector(0, 0, -1)
+    scene.range = 2.2
+
+    # stars background (one numpy draw for all coordinates)
+    star_xyz = (np.random.random((N_STARS, 3)) - 0.5) * 50
+    points(
+        pos=[vector(*p) for p in star_xyz.tolist()],
+        size=vector(2,2,2),
+        color=color.white
+    )
+
+    # Earth (built-in texture stable)
+    earth = sphere(radius=1, texture=textures.earth, shininess=0.8)
+
+    # lighting
+    local_light(pos=vector(10, 0, 0), color=color.white)
+
+    # orbit ring
+    ring(pos=vector(0,0,0), axis=vector(0,1,0), radius=1.15, thickness=0.015, color=color.gray(0.6))
+
+    return scene, earth
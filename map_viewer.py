@@ -1,12 +1,14 @@
-import pandas as pd
+import csv
 import time
 import matplotlib.pyplot as plt
 import cartopy.crs as ccrs
 import cartopy.feature as cfeature
 import os
+from collections import deque
 
 # Path to your ISS telemetry file
 path = "data/iss_telemetry.csv"
+MAX_POINTS = 500   # show last 500 points max
 
 # --- Initialize map ---
 plt.ion()  # interactive mode on
@@ -20,24 +22,54 @@ ax.set_title("ISS Ground Track - Live View")
 line, = ax.plot([], [], color='red', linewidth=2, transform=ccrs.Geodetic())
 plt.show(block=False)
 
+# --- Incremental tail state ---
+track = deque(maxlen=MAX_POINTS)   # (lon, lat) of the newest rows
+n_points = 0                       # total data rows seen
+offset = 0                         # byte offset just past the last complete line read
+lat_i = lon_i = None               # column indices, taken from the header
+
+def read_new_rows():
+    """Parse only the complete lines appended since the last call."""
+    global offset, n_points, lat_i, lon_i
+    if os.path.getsize(path) < offset:
+        # file was truncated / recreated: start over
+        offset, n_points, lat_i, lon_i = 0, 0, None, None
+        track.clear()
+    with open(path, "rb") as fh:
+        fh.seek(offset)
+        chunk = fh.read()
+    end = chunk.rfind(b"\n") + 1   # leave a partially written last line for next time
+    if end == 0:
+        return
+    rows = csv.reader(chunk[:end].decode("utf-8").splitlines())
+    if lat_i is None:
+        header = next(rows, [])
+        if not {"lat_deg", "lon_deg"}.issubset(header):
+            print("map_viewer: CSV missing required columns (lat_deg, lon_deg).")
+            return
+        lat_i, lon_i = header.index("lat_deg"), header.index("lon_deg")
+    for row in rows:
+        try:
+            track.append((float(row[lon_i]), float(row[lat_i])))
+            n_points += 1
+        except (IndexError, ValueError):
+            continue
+    offset += end
+
 # --- Main update loop ---
 while True:
     try:
         if os.path.exists(path):
-            df = pd.read_csv(path)
+            read_new_rows()
 
-            # Ensure expected columns exist
-            if not df.empty and {"lat_deg", "lon_deg"}.issubset(df.columns):
-                lats = df["lat_deg"].values[-500:]   # show last 500 points max
-                lons = df["lon_deg"].values[-500:]
+            if track:
+                lons, lats = zip(*track)
 
                 # Update plot data
                 line.set_data(lons, lats)
-                ax.set_title(f"ISS Ground Track - {len(df)} points")
+                ax.set_title(f"ISS Ground Track - {n_points} points")
                 fig.canvas.draw_idle()
                 plt.pause(1)
-            else:
-                print("map_viewer: CSV missing required columns (lat_deg, lon_deg).")
         else:
             print(f"map_viewer: File not found at {path}")
 